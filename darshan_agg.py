@@ -1,9 +1,30 @@
-from typing import Dict, List, Tuple
-from functools import reduce
-import darshan
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Tuple
+from functools import partial, reduce
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import os
 import argparse
-import pandas as pd
+
+# darshan, numpy, pandas, and pyarrow are slow to import, so they are
+#   imported where they are used; this keeps e.g. `--help` instant.
+if TYPE_CHECKING :
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+
+# Options used for every parquet file written out.
+PARQUET_ROW_GROUP_SIZE: int = 64000
+PARQUET_WRITER_OPTIONS: Dict[str, any] = {
+    "compression": "snappy",
+    "use_dictionary": True,
+    "write_statistics": True,
+}
+
+# The per-log metadata sits next to the `module=<name>/` directories; the
+#   leading underscore keeps pyarrow dataset discovery from scanning it
+#   along with the module files.
+METADATA_FILENAME: str = "_report_metadata.parquet"
 
 #####################################################
 # Classes                                           #
@@ -13,41 +34,51 @@ import pandas as pd
 # counter-only collections   #
 ##############################
 
+class RecordMetadata(NamedTuple) :
+    rank: int
+    id: int
+
 class counters_coll :
     report_name: str
     report_ids: Dict[str, str]
-    metadata: List[Tuple[int, int]]
-    records: Dict[Tuple[int, int], pd.DataFrame]
+    metadata: List[RecordMetadata]
     collapsed: pd.DataFrame
     module_name: str = "ERR"
+    # darshan record ids are uint64 hashes and ranks are ints, but pandas
+    #   hands them back as int64, uint64, or float64 depending on the report.
+    #   they are settled here so every report of a module shares them.
+    id_dtypes: Dict[str, str] = {"id": "uint64", "rank": "int64"}
 
     def __init__(self, records, report_name, report_ids) :
+        import pandas as pd
+
         self.report_name = report_name
         self.report_ids = report_ids
         self.metadata = []
-        self.records = {}
+
+        # records all share the module's counter columns, so they are
+        #   concatenated once here rather than kept around per record.
+        frames: List[pd.DataFrame] = []
 
         for record in records :
-            record_metadata = (record["rank"], record["id"])
-            # if record_metadata[0] != record["counters"].rank[0] and record_metadata[0] != -1 :
+            record_metadata = RecordMetadata(record["rank"], record["id"])
+            # if record_metadata.rank != record["counters"].rank[0] and record_metadata.rank != -1 :
             #     raise ValueError("Rank of record does not match rank in provided DF.")
-            # if record_metadata[1] != record["counters"].id[0] and record_metadata[1] != -1 :
+            # if record_metadata.id != record["counters"].id[0] and record_metadata.id != -1 :
             #     raise ValueError("ID of record does not match rank in provided DF.")
 
             self.metadata.append(record_metadata)
-            self.records[record_metadata] = record["counters"]
+            frames.append(self._record_df(record))
         
-        self._collapse_rank_id()
+        if frames :
+            collapsed: pd.DataFrame = pd.concat(frames, ignore_index=True)
+            self.collapsed = collapsed.astype(
+                {c: t for c, t in self.id_dtypes.items() if c in collapsed.columns})
+        else :
+            self.collapsed = pd.DataFrame()
     
-    def _collapse_rank_id(self) :
-        output_df: pd.DataFrame = None
-        for i,record in enumerate(self.metadata) :
-            if i == 0 :
-                output_df = self.records[record]
-            else :
-                output_df = pd.concat([output_df, self.records[record]])
-
-        self.collapsed = output_df
+    def _record_df(self, record) -> pd.DataFrame :
+        return record["counters"]
 
     def __add__(self, other: 'counters_coll') -> 'CounterCollColl' :
         return CounterCollColl(self, other)
@@ -70,25 +101,14 @@ class LUSTRE_coll(counters_coll) :
 
 class fcounters_coll(counters_coll) :
     module_name: str = "ERR_fcounters"
-    def __init__(self, records, report_name, report_ids):
-        self.report_name = report_name
-        self.report_ids = report_ids
-        # doesn't use super, might want to change it to use it but
-        #   then we're looping over records twice and that's mildly annoying
-        self.metadata = []
-        self.records = {}
 
-        for record in records :
-            record_metadata = (record["rank"], record["id"])
-            self.metadata.append(record_metadata)
+    def _record_df(self, record) -> pd.DataFrame :
+        import pandas as pd
 
-            combined: pd.DataFrame = pd.merge(
-                record["counters"], record["fcounters"], "left",
-                ["id","rank"])
-
-            self.records[record_metadata] = combined
-        
-        self._collapse_rank_id()
+        combined: pd.DataFrame = pd.merge(
+            record["counters"], record["fcounters"], "left",
+            ["id","rank"])
+        return combined
 
 class STDIO_coll(fcounters_coll) :
     module_name:str = "STDIO"
@@ -108,24 +128,80 @@ class POSIX_coll(fcounters_coll) :
 
 class DXT_POSIX_coll(fcounters_coll) :
     module_name:str = "DXT_POSIX"
+    metadata: pd.DataFrame
+    # columns every segment has; used when a report has no segments at all.
+    segment_columns: Dict[str, str] = {
+        "offset": "int64",
+        "length": "int64",
+        "start_time": "float64",
+        "end_time": "float64",
+    }
+
     def __init__(self, records, report_name, report_ids) :
+        import numpy as np
+        import pandas as pd
+
         self.report_name = report_name
         self.report_ids = report_ids
-        self.metadata = []
-        self.records= {}
-
-        for record in records :
-            record_metadata = (record["rank"], str(record["id"]), record["hostname"],
-                                record["write_count"], record["read_count"])
-            self.metadata.append(record_metadata)
 
-            r_df: pd.DataFrame = record['read_segments'].assign(seg_type="read")
-            w_df: pd.DataFrame = record['write_segments'].assign(seg_type="write")
+        # records are the raw darshan DXT records, whose segments are lists
+        #   of dicts. rather than making two dataframes per record and
+        #   concatenating them, every segment is gathered into one list and
+        #   a single dataframe is built for the whole report.
+        segments: List[Dict] = []
+        # read then write segment counts of each record, in order.
+        segment_counts: List[int] = []
+
+        # metadata is kept column-wise and turned into a dataframe at the end.
+        ranks: List[int] = []
+        ids: List[str] = []
+        hostnames: List[str] = []
+        write_counts: List[int] = []
+        read_counts: List[int] = []
 
-            rw_df: pd.DataFrame = pd.concat([r_df, w_df]).assign(rank=record["rank"], id=str(record["id"]))
-            self.records[record_metadata] = rw_df
+        for record in records :
+            ranks.append(record["rank"])
+            ids.append(str(record["id"]))
+            hostnames.append(record["hostname"])
+            write_counts.append(record["write_count"])
+            read_counts.append(record["read_count"])
+
+            read_segments: List[Dict] = record["read_segments"]
+            write_segments: List[Dict] = record["write_segments"]
+            segments.extend(read_segments)
+            segments.extend(write_segments)
+            segment_counts.append(len(read_segments))
+            segment_counts.append(len(write_segments))
+
+        self.metadata = pd.DataFrame({
+            "id": ids,
+            "rank": ranks,
+            "hostname": hostnames,
+            "write_count": write_counts,
+            "read_count": read_counts,
+        })
+
+        if ranks :
+            # spread the per-record values over each record's segments.
+            per_record: np.ndarray = np.add.reduceat(segment_counts, np.arange(0, len(segment_counts), 2))
+            # a fixed categorical is written out as a dictionary-encoded
+            #   column, so tagging every segment costs next to nothing.
+            seg_type = pd.Categorical.from_codes(
+                np.repeat(np.tile([0, 1], len(ranks)), segment_counts),
+                categories=["read", "write"])
+
+            if segments :
+                segments_df: pd.DataFrame = pd.DataFrame.from_records(segments)
+            else :
+                segments_df = pd.DataFrame({c: pd.Series(dtype=t) for c, t in self.segment_columns.items()})
 
-        self._collapse_rank_id()
+            self.collapsed = segments_df.assign(
+                seg_type=seg_type,
+                rank=np.repeat(ranks, per_record),
+                id=np.repeat(np.array(ids, dtype=object), per_record),
+                hostname=np.repeat(np.array(hostnames, dtype=object), per_record))
+        else :
+            self.collapsed = pd.DataFrame()
 
 ##############################
 # collection collections     #
@@ -138,47 +214,94 @@ class DXT_POSIX_coll(fcounters_coll) :
 class CounterCollColl :
     _type: type
     module_name: str
-    collection: pd.DataFrame
+    frames: List[pd.DataFrame]
 
-    def __init__(self, left: counters_coll, right: counters_coll) :
-        if type(left) is not type(right) :
+    def __init__(self, left: counters_coll, right: counters_coll = None) :
+        if right is not None and type(left) is not type(right) :
             raise ValueError("Attempted to combine a %s and a %s." % 
                              (str(type(left)), str(type(right))))
         
         self._type = type(left)
         self.module_name = left.module_name
-        l_df: pd.DataFrame = left.collapsed
-        l_ids = left.report_ids
-        r_df: pd.DataFrame = right.collapsed
-        r_ids = right.report_ids
 
+        # keep one dataframe per report; they are only combined on export.
+        self.frames = [self._with_ids(left)]
+        if right is not None :
+            self.frames.append(self._with_ids(right))
+
+    @staticmethod
+    def _with_ids(coll: counters_coll) -> pd.DataFrame :
         # add ids info as columns
-        l_df = l_df.assign(juid=l_ids['juid'], jobid=l_ids['jobid'])
-        r_df = r_df.assign(juid=r_ids['juid'], jobid=r_ids['jobid'])
+        ids = coll.report_ids
+        return coll.collapsed.assign(juid=ids['juid'], jobid=ids['jobid'])
+
+    @property
+    def collection(self) -> pd.DataFrame :
+        import pandas as pd
 
-        self.collection = pd.concat([l_df,r_df])
+        return pd.concat(self.frames)
 
     def _file_fillers (self, module_name: str):
-        file_prefix = module_name
+        # hive-style partition directory, e.g. `module=POSIX/`
+        file_prefix = "module=%s" % module_name
         file_suffix = ".parquet"
         return (file_prefix, file_suffix)
 
     def export_parquet(self, directory: str, ltype: str = "counters") :
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
         file_prefix, file_suffix = self._file_fillers(self.module_name)
 
-        filename = "%s_%s%s" % (file_prefix, ltype, file_suffix)
-        self.collection.to_parquet(os.path.join(directory, filename))
+        module_dir = os.path.join(directory, file_prefix)
+        os.makedirs(module_dir, exist_ok=True)
+        filename = "%s%s" % (ltype, file_suffix)
+
+        # every report is conformed to one schema and the tables are
+        #   concatenated, so row groups are sized by PARQUET_ROW_GROUP_SIZE
+        #   rather than one per report; readers can still prune row groups
+        #   using the juid/jobid statistics.
+        #   dtypes are not stable across reports (e.g. `id` or `rank` is int64
+        #   in some logs and float64 in others), so the writer schema is the
+        #   permissive union of every report's schema and each table is
+        #   conformed to it.
+        #   reports without any records (an empty `collapsed`) carry no
+        #   counter columns, so they are left out entirely.
+        frames: List[pd.DataFrame] = [df for df in self.frames if len(df)]
+        if not frames :
+            return
+
+        # each frame goes through pandas conversion once; the writer schema
+        #   is unified from the resulting tables.
+        tables: List[pa.Table] = [pa.Table.from_pandas(df, preserve_index=False)
+                                  for df in frames]
+        schema: pa.Schema = pa.unify_schemas(
+            [t.schema for t in tables], promote_options="permissive").remove_metadata()
+        combined: pa.Table = pa.concat_tables([self._conform(t, schema) for t in tables])
+        pq.write_table(combined.replace_schema_metadata(None),
+                       os.path.join(module_dir, filename),
+                       row_group_size=PARQUET_ROW_GROUP_SIZE, **PARQUET_WRITER_OPTIONS)
+
+    @staticmethod
+    def _conform(table: pa.Table, schema: pa.Schema) -> pa.Table :
+        import pyarrow as pa
+
+        # reorder to the schema's columns, filling any column a report
+        #   doesn't have with nulls, then promote the types. the cast is
+        #   safe, so a value that doesn't fit the promoted type raises.
+        if table.schema.remove_metadata().equals(schema) :
+            return table
+        columns = [table.column(field.name) if field.name in table.column_names
+                   else pa.nulls(table.num_rows, field.type)
+                   for field in schema]
+        return pa.Table.from_arrays(columns, names=schema.names).cast(schema)
 
     def __add__(self, other: counters_coll) :
         if type(other) is not self._type :
             raise ValueError("Attempted to add a %s to a %s collection" %
             (str(type(other)), str(self._type)))
         
-        r_df: pd.DataFrame = other.collapsed
-        r_ids = other.report_ids
-        r_df = r_df.assign(juid=r_ids['juid'], jobid=r_ids['jobid'])
-
-        self.collection = pd.concat([self.collection,r_df])
+        self.frames.append(self._with_ids(other))
         return self
 
 
@@ -187,7 +310,52 @@ class CounterCollColl :
 # Main functions                                    #
 #####################################################
 
-def read_log(filename:str, debug:bool = False) -> List[Dict]:
+# modules read by `read_log`, in the order they are loaded.
+COLLECTED_MODULES: List[str] = ["POSIX", "LUSTRE", "STDIO", "DXT_POSIX"]
+
+def _read_module(report, module: str, report_name: str,
+                 report_ids: Dict[str, str]) -> Tuple[str, counters_coll]:
+    """Reads a single module of the provided, already open, darshan report.
+
+    Returns the key the collection is stored under in `read_log`'s output
+    along with the collection itself.
+    """
+    if module == "POSIX" :
+        report.mod_read_all_records("POSIX",dtype="pandas")
+        return ("POSIX_coll", POSIX_coll(report.records["POSIX"], report_name, report_ids))
+
+    if module == "LUSTRE" :
+        report.mod_read_all_lustre_records(dtype="pandas")
+        return ("LUSTRE_coll", LUSTRE_coll(report.records["LUSTRE"], report_name, report_ids))
+
+    if module == "STDIO" :
+        report.mod_read_all_records("STDIO", dtype="pandas")
+        return ("STDIO_coll", STDIO_coll(report.records["STDIO"], report_name, report_ids))
+
+    if module == "DXT_POSIX" :
+        # note that this generates dictionaries, which then contain lists of segments inside them.
+        #   they are handed over as-is; DXT_POSIX_coll builds the dataframe itself
+        #   instead of going through to_df() for every record.
+        report.mod_read_all_dxt_records("DXT_POSIX")
+
+        # created a custom output object to deal with it
+        return ("DXT_POSIX_coll_object", DXT_POSIX_coll(report.records['DXT_POSIX'], report_name, report_ids))
+
+    raise ValueError("Reading module %s is not supported." % module)
+
+def _read_module_file(filename: str, module: str, report_name: str,
+                      report_ids: Dict[str, str]) -> Tuple[str, counters_coll]:
+    """Reads a single module of the provided `.darshan` log file.
+
+    Opens its own `DarshanReport` so that several modules of the same log
+    can be read at the same time from different threads.
+    """
+    import darshan
+
+    with darshan.DarshanReport(filename, read_all=False) as report :
+        return _read_module(report, module, report_name, report_ids)
+
+def read_log(filename:str, debug:bool = False, threaded:bool = False) -> List[Dict]:
     """Read the provided `.darshan` log file.
     
     Manually reads in the provided `.darshan` log file by loading in its
@@ -202,7 +370,17 @@ def read_log(filename:str, debug:bool = False) -> List[Dict]:
     ```
     Currently unsupported: HEATMAP in mod_read_all_records().
     ```
+
+    The returned dictionary only holds picklable data (metadata, ids,
+    and the module collections) so it can be sent back from a worker
+    process; the `DarshanReport` itself is closed and not returned.
+
+    By default the modules are read one after the other from a single
+    report. With `threaded`, each module is read in its own thread from
+    its own `DarshanReport`, which opens the log once more per module.
     """
+    import darshan
+
     if debug :
         print("\tReading darshan log %s" % filename)
     
@@ -240,34 +418,23 @@ def read_log(filename:str, debug:bool = False) -> List[Dict]:
             if m not in expected_modules :
                 print("unexpected module found: %s" % m)
 
-        loaded_modules = []
-
-        # Get data for each found module
-        if "POSIX" in modules :
-            report.mod_read_all_records("POSIX",dtype="pandas")
-            #print(filename)
-            #print(report.records["POSIX"])
-            output["POSIX_coll"] = POSIX_coll(report.records["POSIX"], report_name, report_ids)
-            loaded_modules.append("POSIX_coll")
-        
-        if "LUSTRE" in modules :
-            report.mod_read_all_lustre_records(dtype="pandas")
-            output["LUSTRE_coll"] = LUSTRE_coll(report.records["LUSTRE"], report_name, report_ids)
-            loaded_modules.append("LUSTRE_coll")
-
-        if "STDIO" in modules :
-            report.mod_read_all_records("STDIO", dtype="pandas")
-            output["STDIO_coll"] = STDIO_coll(report.records["STDIO"], report_name, report_ids)
-            loaded_modules.append("STDIO_coll")
+        # Get data for each found module. When threaded, each module is
+        #   read in its own thread from its own report, since a DarshanReport
+        #   is not safe to share between threads.
+        present: List[str] = [m for m in COLLECTED_MODULES if m in modules]
+        loaded_modules: List[str] = []
 
-        if "DXT_POSIX" in modules :
-            # note that this generates a list of dictionaries, which then contain dataframes inside them
-            report.mod_read_all_dxt_records("DXT_POSIX")
-            pos = report.records['DXT_POSIX'].to_df()
+        if threaded and len(present) > 1 :
+            with ThreadPoolExecutor(max_workers=len(present)) as executor :
+                futures = [executor.submit(_read_module_file, filename, m, report_name, report_ids)
+                           for m in present]
+            results = [f.result() for f in futures]
+        else :
+            results = [_read_module(report, m, report_name, report_ids) for m in present]
 
-            # created a custom output object to deal with it
-            output["DXT_POSIX_coll_object"] = DXT_POSIX_coll(pos, report_name, report_ids)
-            loaded_modules.append("DXT_POSIX_coll_object")
+        for output_key, coll in results :
+            output[output_key] = coll
+            loaded_modules.append(output_key)
 
         # Received message: Skipping. Currently unsupported: HEATMAP in mod_read_all_records().
         # if "HEATMAP" in modules :
@@ -283,8 +450,7 @@ def read_log(filename:str, debug:bool = False) -> List[Dict]:
             report.mod_read_all_dxt_records("DXT_MPIIO", dtype="pandas")
             print("############### DXT MPI IO ###############")
             print(report.records["DXT_MPIIO"])
-    
-    output["report"] = report
+
     output["loaded_modules"] = loaded_modules
 
     return output
@@ -306,8 +472,10 @@ def collect_logfiles(directory:str, debug:bool = False) -> List[str]:
         print("\tPath %s has been found and confirmed a directory. Moving on..." % directory)
 
     # collect all the files in the provided directory; filter to only `.darshan` log files.
-    files: List[str] = [f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))]
-    logfiles: List[str] = [f for f in files if os.path.splitext(f)[1] == ".darshan"]
+    #   scandir entries carry their file type, so this doesn't stat every entry.
+    with os.scandir(directory) as entries :
+        logfiles: List[str] = [e.name for e in entries
+                               if e.name.endswith(".darshan") and e.is_file()]
 
     if debug :
         print("\tFound %i .darshan log files." % len(logfiles))
@@ -321,6 +489,7 @@ def move_metadata_into_dataframe(report_data: Dict[str, Dict], debug: bool = Fal
     log for all of the darshan logs provided and collects them into a
     dataframe for storage.
     """
+    import pandas as pd
 
     # Names are taken from the 'metadata' attribute of the darshan report.
     mdf_header: List[str] = [
@@ -337,32 +506,63 @@ def move_metadata_into_dataframe(report_data: Dict[str, Dict], debug: bool = Fal
         "exe"
     ]
 
-    # Create dataframe to store metadata.
-    metadata_df: pd.DataFrame = pd.DataFrame(columns=mdf_header)
+    # Gather rows first and build the dataframe once at the end; growing
+    #   it with `.loc` copies the whole frame for every report.
+    rows: List[Tuple] = []
+    names: List[str] = []
 
-    for report_name in list(report_data.keys()) :
-        report = report_data[report_name]
-        # Gather metadata and put into an array.
-        
-        values = [] # no type hint bc type varies
-        # exe is under 'metadata' directly not 'job' so we can't do it
-        #   as part of the for loop.
-        for val in mdf_header[:-1] : 
-            values.append(report['metadata']['job'][val])
-        values.append(report['metadata']['exe'])
-
-        # Make sure names aren't being duplicated.
-        if report_name in metadata_df.index.values.tolist() :
-            raise ValueError("The name %s is not unique -- attempted to insert a row into the metadata df into a location that already exists!" % report_name)
+    # pulls every 'job' field out of the metadata in a single call.
+    get_job_fields = itemgetter(*mdf_header[:-1])
+
+    for report_name, report in report_data.items() :
+        # Gather metadata and put into a tuple.
+        metadata: Dict = report['metadata']
         
-        # Add to dataframe.
-        metadata_df.loc[report_name] = values
+        # exe is under 'metadata' directly not 'job' so we can't get it
+        #   along with the other fields.
+        rows.append((*get_job_fields(metadata['job']), metadata['exe'])) # no type hint bc type varies
+        names.append(report_name)
+
+    # Make sure names aren't being duplicated.
+    if len(set(names)) != len(names) :
+        raise ValueError("Report names are not unique -- attempted to insert multiple rows into the metadata df at the same location!")
+
+    # Create dataframe to store metadata.
+    metadata_df: pd.DataFrame = pd.DataFrame.from_records(
+        rows, index=pd.Index(names, name="report"), columns=mdf_header)
     
     if debug : print(metadata_df)
 
     # Return dataframe containing all report metadata.
     return(metadata_df)
 
+def summarize_metadata(metadata_df: pd.DataFrame) -> pd.DataFrame:
+    """Computes per-user statistics from the collected metadata.
+
+    Groups the dataframe produced by `move_metadata_into_dataframe` by
+    `uid` and reports the number of logs, processes, and the run time and
+    wall-clock duration ranges of their jobs.
+    """
+    import numpy as np
+
+    # wall-clock duration of every job, computed on the raw column arrays.
+    start: np.ndarray = (metadata_df["start_time_sec"].to_numpy(dtype=np.float64)
+                         + metadata_df["start_time_nsec"].to_numpy(dtype=np.float64) * 1e-9)
+    end: np.ndarray = (metadata_df["end_time_sec"].to_numpy(dtype=np.float64)
+                       + metadata_df["end_time_nsec"].to_numpy(dtype=np.float64) * 1e-9)
+
+    summary: pd.DataFrame = metadata_df.assign(duration=end - start).groupby("uid").agg(
+        n_logs=("jobid", "size"),
+        total_nprocs=("nprocs", "sum"),
+        min_run_time=("run_time", "min"),
+        max_run_time=("run_time", "max"),
+        total_run_time=("run_time", "sum"),
+        min_duration=("duration", "min"),
+        max_duration=("duration", "max"),
+    )
+
+    return(summary)
+
 def write_to_parquet(report_data: Dict[str, Dict], 
                      metadata_df: pd.DataFrame, 
                      output_dir: str, debug: bool = False) -> None:
@@ -370,15 +570,12 @@ def write_to_parquet(report_data: Dict[str, Dict],
     if os.path.exists(output_dir) and not os.path.isdir(output_dir) :
         raise ValueError("Provided directory %s exists and is not a directory. Aborting." % output_dir)
 
-    elif os.path.exists(output_dir) :
-        if debug : print("Path exists and is a directory. Proceeding.")
-
-    elif not os.path.exists(output_dir) :
-        if debug : print("Provided directory does not exist. Creating.")
-        os.mkdir(output_dir)
+    if debug : print("Creating %s if it does not already exist." % output_dir)
+    os.makedirs(output_dir, exist_ok=True)
 
-    metadata_df_filename = os.path.join(output_dir, "metadata.parquet")
-    metadata_df.to_parquet(metadata_df_filename)
+    metadata_df_filename = os.path.join(output_dir, METADATA_FILENAME)
+    metadata_df.to_parquet(metadata_df_filename, engine="pyarrow",
+                           row_group_size=PARQUET_ROW_GROUP_SIZE, **PARQUET_WRITER_OPTIONS)
 
     if debug: print("Metadata df written to %s." % metadata_df_filename)
 
@@ -399,39 +596,67 @@ def write_to_parquet(report_data: Dict[str, Dict],
 
     all_modules: Dict[str, any] = {}
 
-    for report_name in list(report_data.keys()) :
-        report: Dict = report_data[report_name]
-
+    for report in report_data.values() :
         loaded_modules: List[str] = report["loaded_modules"]
 
         for module_name in loaded_modules :
-            if module_name not in all_modules.keys() :
+            if module_name not in all_modules :
                 all_modules[module_name] = [report[module_name]]
             else :
                 all_modules[module_name].append(report[module_name])
             #report[module_name].export_parquet(output_dir, report_name)
     
-    for module in list(all_modules.keys()) :
-        res: CounterCollColl = reduce(lambda x,y: x+y, all_modules[module])
-        res.export_parquet(output_dir)
+    module_collections: List[CounterCollColl] = []
+    for module in all_modules :
+        # start from a collection so modules seen in a single report still
+        #   end up in their own file.
+        colls: List[counters_coll] = all_modules[module]
+        res: CounterCollColl = reduce(lambda x,y: x+y, colls[1:], CounterCollColl(colls[0]))
+        module_collections.append(res)
+
+    # every module goes to its own file, and pyarrow releases the GIL while
+    #   encoding/compressing, so the writes can overlap in threads.
+    if module_collections :
+        n_threads: int = min(32, (os.cpu_count() or 1) * 2, len(module_collections))
+        with ThreadPoolExecutor(max_workers=n_threads) as executor :
+            # consume the results so any exception raised while writing surfaces here.
+            list(executor.map(lambda c: c.export_parquet(output_dir), module_collections))
 
     if debug: print("Done writing parquet files!")
 
-def aggregate_darshan(directory:str, output_loc:str, debug:bool = False) :
+def aggregate_darshan(directory:str, output_loc:str, debug:bool = False,
+                      max_workers:int = None) :
     '''Runs the darshan log aggregation process.
 
     Collects the list of all `.darshan` files present in the provided
     directory and reads what data is available. Then compiles all of
     their data into a new `pandas.DataFrame` and ... TODO
+
+    Log files are read in parallel using up to `max_workers` processes
+    (defaults to the number of CPUs); with a single worker they are read
+    in this process instead.
     '''
     files: List[str] = collect_logfiles(directory, debug)
     collected_report_data: Dict[str, Dict] = {}
 
     if debug : print("Beginning to collect log data...")
 
-    for f in files :
-        tmp_report_data = read_log(os.path.join(directory, f), debug=debug)
-        collected_report_data[tmp_report_data["report_name"]] = tmp_report_data
+    logfiles: List[str] = [os.path.join(directory, f) for f in files]
+    n_workers: int = max_workers if max_workers else (os.cpu_count() or 1)
+    chunksize: int = max(1, len(logfiles) // (4 * n_workers))
+
+    # each log is read independently, so spread them over processes to
+    #   get around the GIL while darshan/pandas build the dataframes. a
+    #   single worker doesn't need a pool at all.
+    if n_workers == 1 :
+        for logfile in logfiles :
+            tmp_report_data = read_log(logfile, debug=debug)
+            collected_report_data[tmp_report_data["report_name"]] = tmp_report_data
+    else :
+        with ProcessPoolExecutor(max_workers=n_workers) as executor :
+            for tmp_report_data in executor.map(partial(read_log, debug=debug),
+                                                logfiles, chunksize=chunksize) :
+                collected_report_data[tmp_report_data["report_name"]] = tmp_report_data
     
     if debug : print("Done collecting data!")
 
@@ -441,9 +666,11 @@ def aggregate_darshan(directory:str, output_loc:str, debug:bool = False) :
 
     if debug : print("Done collecting metadata!")
 
+    if debug : print(summarize_metadata(metadata_df))
+
     write_to_parquet(collected_report_data, metadata_df, output_loc, debug)
 
-    # TODO : perform some statistics.
+    # TODO : perform more statistics.
     #           e.g. how many of each type of module is present
     #           size ranges of data stored
 
@@ -459,6 +686,8 @@ if __name__ == "__main__":
                         help="If true, prints additional debug messages during runtime.")
     parser.add_argument("--output", default="parquet/",
                         help="Where to write the JSON dump of the aggregated DARSHAN logs.")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Number of processes used to read the darshan logs. Defaults to the number of CPUs.")
     args = parser.parse_args()
 
-    aggregate_darshan(args.directory, args.output, args.debug)
+    aggregate_darshan(args.directory, args.output, args.debug, args.jobs)
@@ -20,7 +20,7 @@ def test_read_write_concat(ImageProcessingFixture, tmp_path) :
     
     darshan_agg.aggregate_darshan("tests/test_data/ImageProcessing1", os.path.join(tmp_path))
 
-    saved_dxt_posix = pd.read_parquet(os.path.join(tmp_path, "DXT_POSIX_counters.parquet"))
+    saved_dxt_posix = pd.read_parquet(os.path.join(tmp_path, "module=DXT_POSIX", "counters.parquet"))
 
     for r in records :
         if "DXT_POSIX_coll_object" in r['loaded_modules']:
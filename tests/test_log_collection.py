@@ -0,0 +1,21 @@
+import pytest
+import os
+import darshan_agg
+
+
+TEST_FILE_DIR = "tests/test_data/ImageProcessing1"
+
+def test_collect_logfiles_skips_partial_logs() :
+    logfiles = darshan_agg.collect_logfiles(TEST_FILE_DIR)
+
+    assert len(logfiles) == 33
+    assert all(f.endswith(".darshan") for f in logfiles)
+    assert "mpiexec_id12761-12761_4-18-57269-1827646417573579734.darshan_partial" not in logfiles
+
+def test_collect_logfiles_skips_directories(tmp_path) :
+    (tmp_path / "a.darshan").write_bytes(b"")
+    (tmp_path / "b.darshan_partial").write_bytes(b"")
+    (tmp_path / "c.txt").write_bytes(b"")
+    os.mkdir(tmp_path / "d.darshan")
+
+    assert darshan_agg.collect_logfiles(str(tmp_path)) == ["a.darshan"]
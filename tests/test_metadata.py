@@ -0,0 +1,36 @@
+import pytest
+import os
+import darshan_agg
+
+
+TEST_FILE_DIR = "tests/test_data/ImageProcessing1"
+
+@pytest.fixture(scope="module")
+def sample_report_metadata() :
+    import darshan
+
+    report_data = {}
+    for f in darshan_agg.collect_logfiles(TEST_FILE_DIR) :
+        with darshan.DarshanReport(os.path.join(TEST_FILE_DIR, f), read_all=False) as report :
+            job = report.metadata["job"]
+            report_data["juid%s_jobid%s" % (job["uid"], job["jobid"])] = {"metadata": report.metadata}
+    yield report_data
+
+def test_summarize_metadata(sample_report_metadata) :
+    metadata_df = darshan_agg.move_metadata_into_dataframe(sample_report_metadata)
+    summary = darshan_agg.summarize_metadata(metadata_df)
+
+    jobs = [r["metadata"]["job"] for r in sample_report_metadata.values()]
+    durations = [(j["end_time_sec"] + j["end_time_nsec"] * 1e-9)
+                 - (j["start_time_sec"] + j["start_time_nsec"] * 1e-9) for j in jobs]
+
+    # every sample log was written by the same user.
+    assert summary.index.tolist() == [37993]
+    row = summary.loc[37993]
+    assert row["n_logs"] == 33
+    assert row["total_nprocs"] == sum(j["nprocs"] for j in jobs)
+    assert row["min_run_time"] == pytest.approx(min(j["run_time"] for j in jobs))
+    assert row["max_run_time"] == pytest.approx(max(j["run_time"] for j in jobs))
+    assert row["total_run_time"] == pytest.approx(sum(j["run_time"] for j in jobs))
+    assert row["min_duration"] == pytest.approx(min(durations))
+    assert row["max_duration"] == pytest.approx(max(durations))
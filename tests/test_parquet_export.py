@@ -0,0 +1,141 @@
+import pytest
+import os
+import darshan_agg
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+
+
+def make_lustre_coll(ids, ranks, juid, jobid) :
+    records = []
+    for i, r in zip(ids, ranks) :
+        counters = pd.DataFrame({"rank": [r], "id": [i], "LUSTRE_OSTS": [4]})
+        records.append({"rank": r, "id": i, "counters": counters})
+    return darshan_agg.LUSTRE_coll(records, "juid%s_jobid%s" % (juid, jobid),
+                                   {"juid": juid, "jobid": jobid})
+
+def read_module(directory, module) :
+    return pd.read_parquet(os.path.join(directory, "module=%s" % module, "counters.parquet"))
+
+def test_export_round_trip(tmp_path) :
+    left = make_lustre_coll([1, 2], [0, 1], 10, 100)
+    right = make_lustre_coll([3], [0], 10, 101)
+
+    (left + right).export_parquet(str(tmp_path))
+
+    saved = read_module(tmp_path, "LUSTRE")
+    assert saved["id"].tolist() == [1, 2, 3]
+    assert saved["rank"].tolist() == [0, 1, 0]
+    assert saved["jobid"].tolist() == [100, 100, 101]
+    assert (saved["LUSTRE_OSTS"] == 4).all()
+
+def test_export_mixed_dtypes(tmp_path) :
+    # `id` is int64 in the first report and float64 in the second, with a
+    #   value that doesn't fit in an int64; `rank` is int64 and float64.
+    left = make_lustre_coll([1], [0], 10, 100)
+    right = make_lustre_coll([10913561357919748096.0, 2.0], [0.0, 1.0], 10, 101)
+    assert left.collapsed["id"].dtype == right.collapsed["id"].dtype == np.uint64
+    assert left.collapsed["rank"].dtype == right.collapsed["rank"].dtype == np.int64
+
+    (left + right).export_parquet(str(tmp_path))
+
+    saved = read_module(tmp_path, "LUSTRE")
+    assert saved["id"].dtype == np.uint64
+    assert saved["id"].tolist() == [1, 10913561357919748096, 2]
+    assert saved["rank"].tolist() == [0, 0, 1]
+
+def test_export_shares_row_groups_across_reports(tmp_path) :
+    import pyarrow.parquet as pq
+
+    coll = make_lustre_coll([1], [0], 10, 100)
+    for jobid in range(101, 110) :
+        coll = coll + make_lustre_coll([jobid], [0], 10, jobid)
+
+    coll.export_parquet(str(tmp_path))
+
+    saved = pq.ParquetFile(os.path.join(tmp_path, "module=LUSTRE", "counters.parquet"))
+    assert saved.metadata.num_rows == 10
+    assert saved.metadata.num_row_groups == 1
+
+def test_export_uint64_and_int64_ids(tmp_path) :
+    left = make_lustre_coll(np.array([1], dtype=np.int64), [0], 10, 100)
+    right = make_lustre_coll(np.array([10913561357919748096], dtype=np.uint64), [0], 10, 101)
+
+    (left + right).export_parquet(str(tmp_path))
+
+    saved = read_module(tmp_path, "LUSTRE")
+    assert saved["id"].tolist() == [1, 10913561357919748096]
+
+def test_export_raises_instead_of_wrapping(tmp_path) :
+    # a counter column that is int64 in one report and holds a uint64
+    #   value past 2**63 in another can't be promoted without wrapping.
+    left = make_lustre_coll([1], [0], 10, 100)
+    right = make_lustre_coll([2], [0], 10, 101)
+    left.collapsed["LUSTRE_OSTS"] = np.array([4], dtype=np.int64)
+    right.collapsed["LUSTRE_OSTS"] = np.array([2**63], dtype=np.uint64)
+
+    with pytest.raises(pa.ArrowInvalid) :
+        (left + right).export_parquet(str(tmp_path))
+
+def test_write_single_report_module(tmp_path) :
+    # STDIO is only present in one of the two reports.
+    def posix_and_stdio(jobid, with_stdio) :
+        ids = {"juid": 10, "jobid": jobid}
+        name = "juid10_jobid%s" % jobid
+        record = {"rank": 0, "id": jobid,
+                  "counters": pd.DataFrame({"id": [jobid], "rank": [0], "OPENS": [1]}),
+                  "fcounters": pd.DataFrame({"id": [jobid], "rank": [0], "F_TIME": [0.5]})}
+        report = {"POSIX_coll": darshan_agg.POSIX_coll([record], name, ids),
+                  "loaded_modules": ["POSIX_coll"]}
+        if with_stdio :
+            report["STDIO_coll"] = darshan_agg.STDIO_coll([record], name, ids)
+            report["loaded_modules"].append("STDIO_coll")
+        return name, report
+
+    report_data = dict([posix_and_stdio(100, True), posix_and_stdio(101, False)])
+    metadata_df = pd.DataFrame({"uid": [10, 10]}, index=list(report_data.keys()))
+
+    darshan_agg.write_to_parquet(report_data, metadata_df, str(tmp_path))
+
+    assert read_module(tmp_path, "POSIX")["jobid"].tolist() == [100, 101]
+    saved_stdio = read_module(tmp_path, "STDIO")
+    assert saved_stdio["jobid"].tolist() == [100]
+    assert saved_stdio["F_TIME"].tolist() == [0.5]
+
+    saved_metadata = pd.read_parquet(os.path.join(tmp_path, darshan_agg.METADATA_FILENAME))
+    assert saved_metadata["uid"].tolist() == [10, 10]
+
+    # the metadata file is not picked up when the output is scanned as a dataset.
+    import pyarrow.dataset as ds
+    scanned = ds.dataset(str(tmp_path), partitioning="hive").files
+    assert not any(darshan_agg.METADATA_FILENAME in f for f in scanned)
+
+def test_export_skips_empty_reports(tmp_path) :
+    empty = darshan_agg.LUSTRE_coll([], "juid10_jobid100", {"juid": 10, "jobid": 100})
+    assert empty.collapsed.empty
+
+    (empty + make_lustre_coll([1], [0], 10, 101)).export_parquet(str(tmp_path))
+
+    saved = read_module(tmp_path, "LUSTRE")
+    assert saved.columns.tolist() == ["rank", "id", "LUSTRE_OSTS", "juid", "jobid"]
+    assert saved["jobid"].tolist() == [101]
+
+def make_dxt_coll(segments, jobid) :
+    records = [{"id": 1, "rank": 0, "hostname": "node0",
+                "write_count": 0, "read_count": len(segments),
+                "read_segments": segments, "write_segments": []}]
+    return darshan_agg.DXT_POSIX_coll(records, "juid10_jobid%s" % jobid,
+                                      {"juid": 10, "jobid": jobid})
+
+def test_export_dxt_report_without_segments(tmp_path) :
+    no_segments = make_dxt_coll([], 100)
+    assert no_segments.collapsed.columns.tolist() == [
+        "offset", "length", "start_time", "end_time", "seg_type", "rank", "id", "hostname"]
+
+    segment = {"offset": 0, "length": 151, "start_time": 0.5, "end_time": 1.0}
+    (no_segments + make_dxt_coll([segment], 101)).export_parquet(str(tmp_path))
+
+    saved = read_module(tmp_path, "DXT_POSIX")
+    assert saved[["offset", "length", "start_time", "end_time"]].values.tolist() == [[0, 151, 0.5, 1.0]]
+    assert saved["seg_type"].tolist() == ["read"]
+    assert saved["jobid"].tolist() == [101]